@@ -1,16 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from ipaddress import ip_address
-from src.database.db import get_db
+from src.database.db import get_db, warm_up_pool
 from src.routes import contacts, auth, users
 from fastapi_limiter import FastAPILimiter
 from src.conf.config import settings
+from src.services.auth import auth_service
+from src.services.cache import cache
 import redis.asyncio as redis
 from starlette.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
 @app.on_event("startup")
@@ -18,24 +20,47 @@ async def startup():
     """
     The startup function is called when the application starts up.
     It's a good place to initialize things that are needed by your app, like database connections or caches.
+    A single Redis connection pool is created here and shared by everything that talks to Redis,
+    and the database pool is filled before the first request comes in.
     
     :return: A coroutine
     :doc-author: Trelent
     """
-    r = await redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
-    await FastAPILimiter.init(r)
+    app.state.redis_pool = redis.ConnectionPool(host=settings.redis_host, port=settings.redis_port, db=0,
+                                                max_connections=50)
+    app.state.redis = redis.Redis(connection_pool=app.state.redis_pool)
+    await FastAPILimiter.init(app.state.redis)
+    cache.init(app.state.redis)
+    auth_service.r = app.state.redis
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        # the app still starts, connections are then opened on demand
+        print(f"Database pool warm-up failed: {e!r}")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    The shutdown function is called when the application shuts down.
+    It closes the Redis client and the connections of the shared pool.
+
+    :return: A coroutine
+    :doc-author: Trelent
+    """
+    await app.state.redis.aclose()
+    await app.state.redis_pool.disconnect()
 
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=['http://127.0.0.1:5500', 'http://localhost:5500'],
+    allow_origin_regex=r'https?://(127\.0\.0\.1|localhost):5500',
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'],
+    allow_headers=['Authorization', 'Content-Type'],
+    max_age=86400,  # browsers may cache the preflight response for a day
 )
 
-ALLOWED_IPS = [ip_address('192.168.1.0'), ip_address('172.16.0.0'), ip_address("127.0.0.1")]
-
 
 @app.get("/")
 async def root():
@@ -50,18 +75,19 @@ async def root():
 
 # ми перевіряємо що наш застосунок нормально піднявся
 @app.get("/api/healthchecker")
-def healthchecker(db: Session = Depends(get_db)):
+async def healthchecker(db: AsyncSession = Depends(get_db)):
     """
     The healthchecker function is used to check the health of the application.
     It can be used by external services such as Kubernetes to determine whether or not this service should be running.
     
-    :param db: Session: Access the database
+    :param db: AsyncSession: Access the database
     :return: A dictionary
     :doc-author: Trelent
     """
     try:
         # Make request
-        result = db.execute(text("SELECT 1")).fetchone()  # SELECT 1 - це все добре
+        result = await db.execute(text("SELECT 1"))
+        result = result.fetchone()  # SELECT 1 - це все добре
         if result is None:
             raise HTTPException(status_code=500, detail="Database is not configured correctly")
         return {"message": "Welcome to FastAPI!"}
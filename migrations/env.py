@@ -27,7 +27,8 @@ target_metadata = Base.metadata
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
-config.set_main_option('sqlalchemy.url', URI)
+# migrations run on the sync driver, the app itself uses asyncpg
+config.set_main_option('sqlalchemy.url', URI.replace('+asyncpg', '+psycopg2'))
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
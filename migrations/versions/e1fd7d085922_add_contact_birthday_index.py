@@ -0,0 +1,28 @@
+"""add contact birthday index
+
+Revision ID: e1fd7d085922
+Revises: 57632c0176ae
+Create Date: 2026-10-14 05:13:33.318796
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1fd7d085922'
+down_revision: Union[str, None] = '57632c0176ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contact_birthday', 'contacts',
+                    ['user_id', sa.text('extract(month from birth_date)'), sa.text('extract(day from birth_date)')],
+                    unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_birthday', table_name='contacts')
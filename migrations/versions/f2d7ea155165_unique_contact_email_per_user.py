@@ -0,0 +1,30 @@
+"""unique contact email per user
+
+Revision ID: f2d7ea155165
+Revises: e1fd7d085922
+Create Date: 2026-10-14 05:26:42.422990
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d7ea155165'
+down_revision: Union[str, None] = 'e1fd7d085922'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_contact_user_email', table_name='contacts')
+    op.drop_index('ix_contacts_email', table_name='contacts')
+    op.create_unique_constraint('uq_contact_user_email', 'contacts', ['user_id', 'email'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_contact_user_email', 'contacts', type_='unique')
+    op.create_index('ix_contacts_email', 'contacts', ['email'], unique=True)
+    op.create_index('ix_contact_user_email', 'contacts', ['user_id', 'email'], unique=False)
@@ -1,3 +1,4 @@
 EMAIL_NOT_CONFIRMED = "Email not confirmed!"
 ACCOUNT_ALREADY_EXISTS = "Account already exists!"
-INVALID_PASSWORD = "Invalid password!"
\ No newline at end of file
+INVALID_PASSWORD = "Invalid password!"
+CONTACT_ALREADY_EXISTS = "Contact with this email or phone already exists!"
\ No newline at end of file
@@ -1,30 +1,68 @@
-import configparser
-import pathlib
+import asyncio
+import logging
 
 from fastapi import HTTPException, status
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.conf.config import settings
 
-URI = settings.sqlalchemy_database_url
+# the app needs the async driver, URLs written for psycopg2 keep working, migrations/env.py turns them back
+URI = settings.sqlalchemy_database_url.replace('+psycopg2', '+asyncpg')
+if URI.startswith('postgresql://'):
+    URI = URI.replace('postgresql://', 'postgresql+asyncpg://', 1)
 
-engine = create_engine(URI, echo=True)
-DBSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# statement logging is only wanted while debugging, keep it off the request path otherwise
+logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+engine = create_async_engine(
+    URI,
+    echo=settings.debug,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+DBSession = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
-def get_db():
+
+async def get_db():
     """
-    The get_db function is a context manager that will automatically close the database session when it goes out of scope.
+    The get_db function is an async context manager that will automatically close the database session when it goes out of scope.
     It also handles any exceptions that occur within the with block, converting them into an appropriate HTTP response.
-    
-    :return: A context manager
+
+    :return: An async context manager
     :doc-author: Trelent
     """
-    db = DBSession()
+    async with DBSession() as db:
+        try:
+            yield db
+        except SQLAlchemyError as err:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+
+
+async def warm_up_pool(timeout: float = 5):
+    """
+    The warm_up_pool function opens pool_size connections at once and returns them to the pool.
+    The pool only connects on demand, so without it the first requests after a start each wait for a new connection.
+    It gives up after timeout seconds, so an unreachable database does not hold up the start.
+
+    :param timeout: float: Set how many seconds the connections may take
+    :return: None, raises TimeoutError or the error of the first failed connection
+    :doc-author: Trelent
+    """
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
     try:
-        yield db
-    except SQLAlchemyError as err:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
-    finally:
-        db.close()
+        async with asyncio.timeout(timeout):
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(engine.pool.size()):
+                    tg.create_task(ping())
+    except ExceptionGroup as err:
+        # all the connections fail for the same reason, the first error tells it
+        raise err.exceptions[0] from None
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, func, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, func, ForeignKey, Boolean, Index, UniqueConstraint, extract
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -9,14 +9,27 @@ class Contact(Base):
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String, nullable=False)
     second_name = Column(String, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)
     phone = Column(String, unique=True, index=True, nullable=False)
     birth_date = Column(Date, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    user = relationship("User", backref="contacts")
+    # the owner is always in the session already, catch any access that would need a SELECT for it
+    user = relationship("User", backref="contacts", lazy="raise_on_sql")
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # emails are unique per user, create() turns a conflict with it into None by ON CONFLICT
+        UniqueConstraint('user_id', 'email', name='uq_contact_user_email'),
+        Index('ix_contact_user_phone', 'user_id', 'phone'),
+        Index('ix_contact_user_first_name', 'user_id', 'first_name'),
+        Index('ix_contact_user_second_name', 'user_id', 'second_name'),
+        Index('ix_contact_user_birth', 'user_id', 'birth_date'),
+        # matches the (month, day) lookup of upcoming birthdays
+        Index('ix_contact_birthday', 'user_id', extract('month', birth_date), extract('day', birth_date))
+        .ddl_if(dialect='postgresql'),
+    )
+
 
 class User(Base):
     __tablename__ = "users"
@@ -1,154 +1,119 @@
-from datetime import date
+from datetime import date, timedelta
 from src.database.models import Contact, User
 from src.schemas import ContactModel
-from sqlalchemy.orm import Session
-from sqlalchemy import extract, and_
+from src.services.cache import cache
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, extract, and_, tuple_, lambda_stmt, update as sql_update
 
 
-async def get_contacts(limit: int, offset: int, user: User, db: Session):
+def contact_cache_key(contact_id: int, user: User) -> str:
     """
-    The get_contacts function returns a list of contacts for the user.
-        
-    
-    :param limit: int: Limit the number of contacts returned
-    :param offset: int: Determine how many contacts to skip before returning the results
-    :param user: User: Get the user_id from the database
-    :param db: Session: Pass in a database session
-    :return: A list of contacts
-    :doc-author: Trelent
-    """
-    contacts = db.query(Contact).filter(Contact.user_id == user.id).limit(limit).offset(offset).all()
-    return contacts
-
-
-async def get_contact_by_id(contact_id: int, user: User, db: Session):
-    """
-    The get_contact_by_id function returns a contact object from the database based on the id of that contact.
-        Args:
-            contact_id (int): The id of the desired Contact object.
-            user (User): The User who owns this Contact.
-            db (Session): A connection to our database, used for querying and updating data in our tables.
-    
-    :param contact_id: int: Get the contact by id
-    :param user: User: Get the user id from the database
-    :param db: Session: Pass the database session to the function
-    :return: A contact object
-    :doc-author: Trelent
-    """
-    contact = db.query(Contact).filter(and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
-    return contact
-
-
-async def get_contact_by_email(email: str, user: User, db: Session):
-    """
-    The get_contact_by_email function returns a contact object from the database based on the email address provided.
-        Args:
-            email (str): The email address of the contact to be retrieved.
-            user (User): The user who owns this contact.
-            db (Session): A database session for querying and updating data in the database.
-    
-    :param email: str: Pass in the email address of the contact we want to get from our database
-    :param user: User: Get the user's id from the database
-    :param db: Session: Pass the database session to the function
-    :return: The contact object from the database
-    :doc-author: Trelent
-    """
-    contact = db.query(Contact).filter(and_(Contact.email == email, Contact.user_id == user.id)).first()
-    return contact
-
+    The contact_cache_key function returns the key the contact is cached under in Redis.
 
-async def get_contact_by_phone(phone: str, user: User, db: Session):
-    """
-    The get_contact_by_phone function returns a contact object from the database based on the phone number and user id.
-        Args:
-            phone (str): The phone number of the contact to be retrieved.
-            user (User): The User object that is associated with this contact.
-            db (Session): A session for interacting with our database.
-        Returns: 
-            Contact: A Contact object containing information about a specific person in your contacts list.
-    
-    :param phone: str: Get the phone number of a contact
-    :param user: User: Get the user_id from the logged in user
-    :param db: Session: Pass the database session to the function
-    :return: A contact object
+    :param contact_id: int: Identify the contact
+    :param user: User: Get the id of the contact owner
+    :return: A string
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(and_(Contact.phone == phone, Contact.user_id == user.id)).first()
-    return contact
+    return f"c:{user.id}:id:{contact_id}"
 
 
-async def get_contact_by_first_name(first_name: str, user: User, db: Session):
+async def get_contacts(limit: int, after_id: int | None, user: User, db: AsyncSession, email: str | None = None,
+                       phone: str | None = None, first_name: str | None = None, second_name: str | None = None,
+                       birth_date: date | None = None):
     """
-    The get_contact_by_first_name function returns a contact object from the database based on the first name of that contact.
-        Args:
-            first_name (str): The first name of the desired contact.
-            user (User): The user who owns this particular contact.
-            db (Session): A session to connect to our database with.
-        Returns: 
-            Contact: A single Contact object from our database, or None if no such Contact exists.
-    
-    :param first_name: str: Filter the database by first name
-    :param user: User: Get the user_id from the user object
-    :param db: Session: Pass in the database session
-    :return: A contact object
-    :doc-author: Trelent
-    """
-    contact = db.query(Contact).filter(and_(Contact.first_name == first_name, Contact.user_id == user.id)).first()
-    return contact
-
+    The get_contacts function returns a list of contacts for the user.
+    Every filter that is not None narrows the result down, all of them are applied in a single query.
+    Only the columns of the response are selected, so the contacts are returned as mappings.
+    The contacts are paginated by id, the id of the last contact of a page is the after_id of the next one.
 
-async def get_contact_by_second_name(second_name: str, user: User, db: Session):
-    """
-    The get_contact_by_second_name function returns a contact object from the database based on the second_name parameter.
-        
-    
-    :param second_name: str: Filter the database query
+    :param limit: int: Limit the number of contacts returned
+    :param after_id: int | None: Return only the contacts after the contact with this id
     :param user: User: Get the user_id from the database
-    :param db: Session: Pass the database session to the function
-    :return: The contact with the second name that you have specified
+    :param db: AsyncSession: Pass in a database session
+    :param email: str | None: Filter contacts by email
+    :param phone: str | None: Filter contacts by phone number
+    :param first_name: str | None: Filter contacts by first name
+    :param second_name: str | None: Filter contacts by second name
+    :param birth_date: date | None: Filter contacts by birth date
+    :return: A list of contact mappings
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(and_(Contact.second_name == second_name, Contact.user_id == user.id)).first()
-    return contact
-
-
-async def get_contact_by_birth_date(birth_date: date, user: User, db: Session):
+    # a lambda statement is compiled once for every combination of filters and reused after that
+    user_id = user.id
+    stmt = lambda_stmt(lambda: select(Contact.id, Contact.first_name, Contact.second_name, Contact.email,
+                                      Contact.phone, Contact.birth_date, Contact.created_at, Contact.updated_at)
+                       .where(Contact.user_id == user_id))
+    if after_id is not None:
+        stmt += lambda s: s.where(Contact.id > after_id)
+    if email is not None:
+        stmt += lambda s: s.where(Contact.email == email)
+    if phone is not None:
+        stmt += lambda s: s.where(Contact.phone == phone)
+    if first_name is not None:
+        stmt += lambda s: s.where(Contact.first_name == first_name)
+    if second_name is not None:
+        stmt += lambda s: s.where(Contact.second_name == second_name)
+    if birth_date is not None:
+        stmt += lambda s: s.where(Contact.birth_date == birth_date)
+    stmt += lambda s: s.order_by(Contact.id).limit(limit)
+    contacts = await db.execute(stmt)
+    # plain rows skip building ORM instances, all of them belong to the given user
+    return [{**contact, "user": user} for contact in contacts.mappings().all()]
+
+
+async def get_contact_by_id(contact_id: int, user: User, db: AsyncSession):
     """
-    The get_contact_by_birth_date function returns a contact object from the database based on the birth_date and user.
+    The get_contact_by_id function returns a contact object from the database based on the id of that contact.
+    The contact is cached in Redis, update and remove drop it from the cache.
         Args:
-            birth_date (str): The date of birth for which to search.
-            user (User): The User object that owns this contact.
-            db (Session): A SQLAlchemy Session instance used to query the database.
+            contact_id (int): The id of the desired Contact object.
+            user (User): The User who owns this Contact.
+            db (AsyncSession): A connection to our database, used for querying and updating data in our tables.
     
-    :param birth_date: date: Specify the birth date of the contact
-    :param user: User: Get the user_id from the user object
-    :param db: Session: Pass the database session to the function
+    :param contact_id: int: Get the contact by id
+    :param user: User: Get the user id from the database
+    :param db: AsyncSession: Pass the database session to the function
     :return: A contact object
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(and_(Contact.birth_date == birth_date, Contact.user_id == user.id)).first()
+    key = contact_cache_key(contact_id, user)
+    contact = await cache.get(key)
+    if contact is not None:
+        # a cached contact is detached, attach it to this session without a SELECT
+        return await db.merge(contact, load=False)
+    user_id = user.id
+    stmt = lambda_stmt(lambda: select(Contact).where(and_(Contact.id == contact_id, Contact.user_id == user_id)))
+    contact = await db.execute(stmt)
+    contact = contact.scalars().first()
+    if contact is not None:
+        await cache.set(key, contact)
     return contact
 
 
-async def create(body: ContactModel, current_user: User, db: Session):
+async def create(body: ContactModel, current_user: User, db: AsyncSession):
     """
     The create function creates a new contact in the database.
-        
+        The insert is skipped if the contact breaks a unique constraint, i.e. the user already has
+        a contact with the same email or the phone is taken,
+        so a duplicate is detected in the same round trip without a SELECT before it.
     
     :param body: ContactModel: Get the data from the request body
     :param current_user: User: Get the current user who is logged in
-    :param db: Session: Access the database
-    :return: A contact object, but the response is a dict
+    :param db: AsyncSession: Access the database
+    :return: A contact object or None if a contact with this email or phone already exists
     :doc-author: Trelent
     """
-    contact = Contact(**body.dict(), user=current_user)
-    db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    stmt = (pg_insert(Contact).values(**body.dict(exclude={"user_id"}), user_id=current_user.id)
+            .on_conflict_do_nothing().returning(Contact))
+    contact = await db.execute(stmt)
+    contact = contact.scalar_one_or_none()
+    await db.commit()
     return contact
 
 
-async def update(contact_id: int, body: ContactModel, user: User, db: Session):
+async def update(contact_id: int, body: ContactModel, user: User, db: AsyncSession):
     """
     The update function updates a contact in the database.
         Args:
@@ -161,57 +126,72 @@ async def update(contact_id: int, body: ContactModel, user: User, db: Session):
     :param contact_id: int: Identify the contact to update
     :param body: ContactModel: Get the data from the request body
     :param user: User: Get the user_id from the token
-    :param db: Session: Access the database
-    :return: The contact object, but the response is empty
+    :param db: AsyncSession: Access the database
+    :return: The updated contact object or None if the contact does not exist
     :doc-author: Trelent
     """
-    contact = await get_contact_by_id(contact_id, user, db)
-    if contact:
-        contact.first_name = body.first_name
-        contact.second_name = body.second_name
-        contact.email = body.email
-        contact.phone = body.phone
-        contact.birth_date = body.birth_date
-        db.commit()
+    stmt = (
+        sql_update(Contact)
+        .where(and_(Contact.id == contact_id, Contact.user_id == user.id))
+        .values(
+            first_name=body.first_name,
+            second_name=body.second_name,
+            email=body.email,
+            phone=body.phone,
+            birth_date=body.birth_date,
+        )
+        .returning(Contact)
+    )
+    contact = await db.execute(stmt)
+    contact = contact.scalar_one_or_none()
+    await db.commit()
+    await cache.delete(contact_cache_key(contact_id, user))
     return contact
 
 
-async def remove(contact_id: int, user: User, db: Session):
+async def remove(contact_id: int, user: User, db: AsyncSession):
     """
     The remove function removes a contact from the database.
         
     
     :param contact_id: int: Identify the contact to be removed
     :param user: User: Get the user id of the current logged in user
-    :param db: Session: Access the database
-    :return: A contact object
+    :param db: AsyncSession: Access the database
+    :return: The id of the removed contact or None if the contact does not exist
     :doc-author: Trelent
     """
-    contact = await get_contact_by_id(contact_id, user, db)
-    if contact:
-        db.delete(contact)
-        db.commit()
-    return contact
+    stmt = delete(Contact).where(and_(Contact.id == contact_id, Contact.user_id == user.id)).returning(Contact.id)
+    removed_id = await db.execute(stmt)
+    removed_id = removed_id.scalar_one_or_none()
+    await db.commit()
+    await cache.delete(contact_cache_key(contact_id, user))
+    return removed_id
 
 
-async def get_contacts_birthday(start_date: date, end_date: date, db: Session):
+async def get_contacts_birthday(start_date: date, end_date: date, user: User, db: AsyncSession):
     """
     The get_contacts_birthday function returns a list of contacts whose birthdays fall between the start_date and end_date.
-    The function takes in three parameters:
+    The function takes in four parameters:
         - start_date: The first date to search for birthdays (inclusive)
         - end_date: The last date to search for birthdays (inclusive)
-        - db: A database session object that is used to query the database. This parameter is required by FastAPI, but not used in this function.
-    
+        - user: The owner of the contacts
+        - db: A database session object that is used to query the database.
+    The range may cross the end of the year, e.g. from December 28 to January 4.
+
     :param start_date: date: Set the start date of the range
     :param end_date: date: Determine the end date of the range
-    :param db: Session: Pass the database session to the function
+    :param user: User: Get the user_id of the contacts owner
+    :param db: AsyncSession: Pass the database session to the function
     :return: A list of contacts that have their birthday between the start and end date
     :doc-author: Trelent
     """
+    days = [(day.month, day.day) for day in
+            (start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1))]
     birth_day = extract('day', Contact.birth_date)
     birth_month = extract('month', Contact.birth_date)
-    contacts = db.query(Contact).filter(
-        birth_month == extract('month', start_date),
-        birth_day.between(extract('day', start_date), extract('day', end_date))
-    ).all()
-    return contacts
+    stmt = select(Contact).where(
+        Contact.user_id == user.id,
+        tuple_(birth_month, birth_day).in_(days)
+    )
+    contacts = await db.execute(stmt)
+    return contacts.scalars().all()
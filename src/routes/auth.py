@@ -2,14 +2,13 @@ from typing import List
 
 from fastapi import Depends, HTTPException, status, APIRouter, Security, BackgroundTasks, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.schemas import UserModel, UserResponse, TokenModel, RequestEmail
 from src.repository import users as repository_users
 from src.services.auth import auth_service
 from src.services.email import send_email
-from fastapi_limiter.depends import RateLimiter
 from src.conf import messages
 
 router = APIRouter(prefix="/auth", tags=['auth'])
@@ -18,7 +17,7 @@ security = HTTPBearer()
 
 # Обмежуйте кількість запитів до своїх маршрутів контактів. Обов’язково обмежте швидкість - створення контактів для користувача;
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED             )
-async def signup(body: UserModel, background_task: BackgroundTasks, request: Request, db: Session = Depends(get_db)):
+async def signup(body: UserModel, background_task: BackgroundTasks, request: Request, db: AsyncSession = Depends(get_db)):
     """
     The signup function creates a new user in the database.
         It also sends an email to the user with a link to verify their account.
@@ -27,7 +26,7 @@ async def signup(body: UserModel, background_task: BackgroundTasks, request: Req
     :param body: UserModel: Validate the input data
     :param background_task: BackgroundTasks: Add a task to the background task queue
     :param request: Request: Get the base url of the application
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :return: A usermodel object
     :doc-author: Trelent
     """
@@ -41,12 +40,12 @@ async def signup(body: UserModel, background_task: BackgroundTasks, request: Req
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     The login function is used to authenticate a user.
     
     :param body: OAuth2PasswordRequestForm: Validate the request body
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :return: A dict with the access_token and refresh_token in it
     :doc-author: Trelent
     """
@@ -65,14 +64,14 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
 
 
 @router.get('/refresh_token', response_model=TokenModel)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_db)):
     """
     The refresh_token function is used to refresh the access token.
     It takes in a refresh token and returns an access_token, a new refresh_token, and the type of token (bearer).
     
     
     :param credentials: HTTPAuthorizationCredentials: Get the token from the request header
-    :param db: Session: Get the database connection
+    :param db: AsyncSession: Get the database connection
     :return: A dictionary with the access_token, refresh_token and token type
     :doc-author: Trelent
     """
@@ -90,7 +89,7 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(sec
 
 
 @router.get('/confirmed_email/{token}')
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     The confirmed_email function is used to confirm a user's email address.
         It takes the token from the URL and uses it to get the user's email address.
@@ -98,7 +97,7 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
         If not, then we update their record in our database with a confirmation of their email.
     
     :param token: str: Get the token from the url
-    :param db: Session: Get the database connection
+    :param db: AsyncSession: Get the database connection
     :return: A dictionary with the message key and a string value
     :doc-author: Trelent
     """
@@ -114,7 +113,7 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
 
 @router.post('/request_email')
 async def request_email(body: RequestEmail, background_task: BackgroundTasks, request: Request,
-                        db: Session = Depends(get_db)):
+                        db: AsyncSession = Depends(get_db)):
     """
     The request_email function is used to send an email to the user with a link that they can click on
     to confirm their email address. The function takes in a RequestEmail object, which contains the user's
@@ -123,7 +122,7 @@ async def request_email(body: RequestEmail, background_task: BackgroundTasks, re
     :param body: RequestEmail: Pass the data from the request body to this function
     :param background_task: BackgroundTasks: Add a task to the background tasks
     :param request: Request: Get the base_url of the request
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :return: A dict with a message key
     :doc-author: Trelent
     """
@@ -1,12 +1,14 @@
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
-import redis
+import redis.asyncio as redis
 import pickle
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer  # Bearer token
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
 from src.database.db import get_db
@@ -19,7 +21,12 @@ class Auth:
     SECRET_KEY = settings.secret_key
     ALGORITHM = settings.algorithm
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+    # replaced by the client of the shared pool on startup, see main.py
     r = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)  # ..
+    # access token -> (expire timestamp, pickled user), checked before the JWT is decoded and Redis is asked
+    users_cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+    users_cache_maxsize = 4096
+    users_cache_ttl = 10
 
     def verify_password(self, plain_password, hashed_password):
         """
@@ -89,17 +96,22 @@ class Auth:
         encoded_refresh_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
         return encoded_refresh_token
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
         """
         The get_current_user function is a dependency that will be used in the protected routes.
         It takes an access token as input and returns the user object if it's valid, otherwise raises an exception.
+        A recently seen token is served from the in-process cache for a few seconds without decoding it again.
         
         :param self: Make the function a method of the class
         :param token: str: Pass the token to the function
-        :param db: Session: Get the database session
+        :param db: AsyncSession: Get the database session
         :return: A user object
         :doc-author: Trelent
         """
+        cached_user = self.get_cached_user(token)
+        if cached_user is not None:
+            return await db.merge(pickle.loads(cached_user), load=False)
+
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -119,20 +131,59 @@ class Auth:
             raise credentials_exception
 
         # user = await repository_users.get_user_by_email(email, db)
-        user = self.r.get(f"user:{email}")
-        if user is None:
+        cached_user = await self.r.get(f"user:{email}")
+        if cached_user is None:
             user = await repository_users.get_user_by_email(email, db)
             if user is None:
                 raise credentials_exception
-            self.r.set(f"user:{email}", pickle.dumps(user))
-            self.r.expire(f"user:{email}", 900)
+            cached_user = pickle.dumps(user)
+            await self.r.set(f"user:{email}", cached_user, ex=900)
         else:
-            user = pickle.loads(user)
+            # a cached user is detached, attach it to this session without a SELECT
+            user = await db.merge(pickle.loads(cached_user), load=False)
 
         if user is None:
             raise credentials_exception
+        self.cache_user(token, cached_user, payload["exp"])
         return user
 
+    def get_cached_user(self, token: str) -> bytes | None:
+        """
+        The get_cached_user function returns the pickled user cached in process for the access token.
+        Expired entries are dropped on the way.
+
+        :param self: Represent the instance of the class
+        :param token: str: Find the cached user
+        :return: The pickled user or None if the token is not cached
+        :doc-author: Trelent
+        """
+        cached = self.users_cache.get(token)
+        if cached is None:
+            return None
+        expire, user = cached
+        if expire <= time.time():
+            self.users_cache.pop(token, None)
+            return None
+        self.users_cache.move_to_end(token)
+        return user
+
+    def cache_user(self, token: str, user: bytes, token_expire: float):
+        """
+        The cache_user function keeps the pickled user of a validated access token in process for users_cache_ttl seconds,
+        but never longer than the token itself is valid. The least recently used token is evicted when the cache is full.
+
+        :param self: Represent the instance of the class
+        :param token: str: Set the key of the cache entry
+        :param user: bytes: Pass the pickled user
+        :param token_expire: float: Pass the exp claim of the token
+        :return: None
+        :doc-author: Trelent
+        """
+        self.users_cache[token] = (min(time.time() + self.users_cache_ttl, token_expire), user)
+        self.users_cache.move_to_end(token)
+        if len(self.users_cache) > self.users_cache_maxsize:
+            self.users_cache.popitem(last=False)
+
     async def decode_refresh_token(self, refresh_token: str):
         """
         The decode_refresh_token function takes a refresh token and decodes it.
@@ -0,0 +1,79 @@
+import pickle
+
+from redis.exceptions import RedisError
+
+
+class Cache:
+    redis = None
+    ttl = 60
+
+    def init(self, redis):
+        """
+        The init function sets the Redis client the cache works with.
+        Until it is called every lookup is a miss, so the cache can be left out, e.g. in tests.
+        Redis errors are never raised to the caller either, a failed lookup is a miss and the data comes from the database.
+
+        :param self: Represent the instance of the class
+        :param redis: Pass the redis.asyncio client
+        :return: None
+        :doc-author: Trelent
+        """
+        self.redis = redis
+
+    async def get(self, key: str):
+        """
+        The get function returns the cached object stored under the key.
+
+        :param self: Represent the instance of the class
+        :param key: str: Find the cached object
+        :return: The unpickled object or None if nothing is cached
+        :doc-author: Trelent
+        """
+        if self.redis is None:
+            return None
+        try:
+            value = await self.redis.get(key)
+        except RedisError as err:
+            print(err)
+            return None
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    async def set(self, key: str, value, ttl: int | None = None):
+        """
+        The set function stores the object under the key for ttl seconds.
+
+        :param self: Represent the instance of the class
+        :param key: str: Set the key of the cached object
+        :param value: Pass the object to be cached
+        :param ttl: int | None: Set the expiration time, Cache.ttl by default
+        :return: None
+        :doc-author: Trelent
+        """
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, pickle.dumps(value), ex=ttl or self.ttl)
+        except RedisError as err:
+            print(err)
+
+    async def delete(self, *keys: str):
+        """
+        The delete function removes the cached objects, it is called whenever the cached data changes.
+        If Redis can not be reached the objects stay cached until their ttl runs out.
+
+        :param self: Represent the instance of the class
+        :param keys: str: Pass the keys to be removed
+        :return: None
+        :doc-author: Trelent
+        """
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as err:
+            print(err)
+
+
+cache = Cache()
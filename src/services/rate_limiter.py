@@ -0,0 +1,102 @@
+import time
+from collections import deque
+from math import ceil
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi_limiter import FastAPILimiter
+
+from src.conf.config import settings
+from src.database.models import User
+from src.services.auth import auth_service
+
+
+class InProcessRateLimiter:
+    def __init__(self, times: int = 1, seconds: int = 0):
+        """
+        The __init__ function sets how many requests a user may send to a route within a time window.
+
+        :param self: Represent the instance of the class
+        :param times: int: Set the number of allowed requests
+        :param seconds: int: Set the length of the window in seconds
+        :return: None
+        :doc-author: Trelent
+        """
+        self.times = times
+        self.milliseconds = seconds * 1000
+        self.hits: dict[tuple, deque[float]] = {}
+
+    async def __call__(self, request: Request, current_user: User = Depends(auth_service.get_current_user)):
+        """
+        The __call__ function is the dependency itself, it counts the request of the current user to the current route.
+        With settings.rate_limit_inprocess the requests are counted in a sliding window in the memory of the process,
+        otherwise in a fixed window in Redis, so the limit is shared between several workers.
+
+        :param self: Represent the instance of the class
+        :param request: Request: Get the route of the request
+        :param current_user: User: Get the user the requests are counted for
+        :return: None, raises HTTPException 429 if the limit is exceeded
+        :doc-author: Trelent
+        """
+        key = (current_user.id, request.scope["route"].path)
+        if settings.rate_limit_inprocess:
+            pexpire = self._hit(key)
+        else:
+            pexpire = await self._hit_redis(key)
+        if pexpire:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too Many Requests",
+                                headers={"Retry-After": str(ceil(pexpire / 1000))})
+
+    def _hit(self, key: tuple) -> float:
+        """
+        The _hit function records a request in the sliding window of the key.
+        Nothing is awaited here, so the window can not be changed by another request in the middle of the check.
+        The key is moved to the end of self.hits on every request, so the windows of users that went quiet
+        gather at the front and are dropped there once they are over.
+
+        :param self: Represent the instance of the class
+        :param key: tuple: Identify the user and the route
+        :return: The milliseconds until a request is allowed again, 0 if the request is allowed
+        :doc-author: Trelent
+        """
+        now = time.monotonic() * 1000
+        start = now - self.milliseconds
+        hits = self.hits.pop(key, None) or deque()
+        while hits and hits[0] <= start:
+            hits.popleft()
+        self.hits[key] = hits
+        if len(hits) >= self.times:
+            pexpire = hits[0] + self.milliseconds - now
+        else:
+            hits.append(now)
+            pexpire = 0
+        while self.hits:
+            oldest = next(iter(self.hits))
+            if self.hits[oldest] and self.hits[oldest][-1] > start:
+                break
+            del self.hits[oldest]
+        return pexpire
+
+    async def _hit_redis(self, key: tuple) -> int:
+        """
+        The _hit_redis function increments the counter of the key in Redis in a single round trip.
+        The counter is created with the expiration of the window and is never prolonged.
+        The commands run in a MULTI, so the counter can not expire between them and lose its expiration,
+        a counter left without one anyway is given the expiration of the window again.
+
+        :param self: Represent the instance of the class
+        :param key: tuple: Identify the user and the route
+        :return: The milliseconds until a request is allowed again, 0 if the request is allowed
+        :doc-author: Trelent
+        """
+        redis_key = f"{FastAPILimiter.prefix}:{key[0]}:{key[1]}"
+        async with FastAPILimiter.redis.pipeline(transaction=True) as pipe:
+            pipe.set(redis_key, 0, px=self.milliseconds, nx=True)
+            pipe.incr(redis_key)
+            pipe.pttl(redis_key)
+            _, current, pexpire = await pipe.execute()
+        if pexpire < 0:
+            await FastAPILimiter.redis.pexpire(redis_key, self.milliseconds)
+            return 0
+        if current > self.times:
+            return pexpire
+        return 0
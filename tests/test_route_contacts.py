@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 
+from src.conf import messages
 from src.database.models import User
 from src.services.auth import auth_service
 
@@ -11,7 +12,9 @@ CONTACT = {
     "email": "test@gmail.com",
     "phone": "0996458844",
     "birth_date": "1993-01-01",   
-    "user_id": 1
+    "user_id": 1,
+    "created_at": "2024-01-01T00:00:00",
+    "updated_at": "2024-01-01T00:00:00"
 }
 
 
@@ -32,7 +35,7 @@ def token(client, user, session, monkeypatch):
 
 
 def test_get_contact(client, token, monkeypatch):
-    with patch.object(auth_service, "r") as redis_mock:
+    with patch.object(auth_service, "r", new_callable=AsyncMock) as redis_mock:
         redis_mock.get.return_value = None
         monkeypatch.setattr('fastapi_limiter.FastAPILimiter.redis', AsyncMock())
         monkeypatch.setattr('fastapi_limiter.FastAPILimiter.identifier', AsyncMock())
@@ -46,7 +49,7 @@ def test_get_contact(client, token, monkeypatch):
 
 
 def test_get_not_found_contact(client, token):
-    with patch.object(auth_service, "r") as redis_mock:
+    with patch.object(auth_service, "r", new_callable=AsyncMock) as redis_mock:
         redis_mock.get.return_value = None
         response = client.get("/api/contacts/22",
                               headers={"Authorization": f"Bearer {token}"})
@@ -54,4 +57,37 @@ def test_get_not_found_contact(client, token):
         assert response.status_code == 404, response.text
         data = response.json()
         assert data["detail"] == "Not Found"
-        
\ No newline at end of file
+
+
+def test_create_contact(client, token):
+    with patch.object(auth_service, "r", new_callable=AsyncMock) as redis_mock:
+        redis_mock.get.return_value = None
+        response = client.post("/api/contacts", json=CONTACT,
+                               headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 201, response.text
+        data = response.json()
+        assert data["email"] == CONTACT["email"]
+        assert "id" in data
+
+
+def test_repeat_create_contact(client, token):
+    with patch.object(auth_service, "r", new_callable=AsyncMock) as redis_mock:
+        redis_mock.get.return_value = None
+        response = client.post("/api/contacts", json={**CONTACT, "phone": "0996458855"},
+                               headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 409, response.text
+        data = response.json()
+        assert data["detail"] == messages.CONTACT_ALREADY_EXISTS
+
+
+def test_create_contact_with_taken_phone(client, token):
+    with patch.object(auth_service, "r", new_callable=AsyncMock) as redis_mock:
+        redis_mock.get.return_value = None
+        response = client.post("/api/contacts", json={**CONTACT, "email": "other@gmail.com"},
+                               headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 409, response.text
+        data = response.json()
+        assert data["detail"] == messages.CONTACT_ALREADY_EXISTS
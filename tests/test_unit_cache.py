@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fakeredis import FakeAsyncRedis
+from redis.exceptions import ConnectionError
+
+from src.services.cache import Cache
+
+
+class TestCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = Cache()
+
+    async def test_without_redis_every_lookup_misses(self):
+        await self.cache.set("key", {"id": 1})
+        self.assertIsNone(await self.cache.get("key"))
+
+    async def test_set_get_delete(self):
+        self.cache.init(FakeAsyncRedis())
+        await self.cache.set("key", {"id": 1})
+        self.assertEqual(await self.cache.get("key"), {"id": 1})
+        await self.cache.delete("key")
+        self.assertIsNone(await self.cache.get("key"))
+
+    async def test_redis_errors_are_misses(self):
+        redis = AsyncMock()
+        redis.get.side_effect = redis.set.side_effect = redis.delete.side_effect = ConnectionError()
+        self.cache.init(redis)
+        with patch("builtins.print"):
+            await self.cache.set("key", {"id": 1})
+            self.assertIsNone(await self.cache.get("key"))
+            await self.cache.delete("key")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fakeredis import FakeAsyncRedis
+from fastapi import HTTPException
+from fastapi_limiter import FastAPILimiter
+
+from src.services.rate_limiter import InProcessRateLimiter
+
+
+class TestInProcessRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.limiter = InProcessRateLimiter(times=3, seconds=10)
+        self.key = (1, "/api/contacts/")
+
+    def hit_at(self, seconds, key=None):
+        with patch("src.services.rate_limiter.time.monotonic", return_value=seconds):
+            return self.limiter._hit(key or self.key)
+
+    def test_hit_allows_up_to_times(self):
+        for seconds in (0, 1, 2):
+            self.assertEqual(self.hit_at(seconds), 0)
+        self.assertEqual(self.hit_at(3), 7000)
+
+    def test_hit_allows_again_after_window(self):
+        for seconds in (0, 1, 2):
+            self.hit_at(seconds)
+        self.assertGreater(self.hit_at(9), 0)
+        self.assertEqual(self.hit_at(10), 0)
+
+    def test_hit_drops_windows_of_quiet_users(self):
+        quiet_key = (2, "/api/contacts/")
+        self.hit_at(0, quiet_key)
+        self.hit_at(5)
+        self.assertIn(quiet_key, self.limiter.hits)
+        self.hit_at(11)
+        self.assertNotIn(quiet_key, self.limiter.hits)
+        self.assertIn(self.key, self.limiter.hits)
+
+    async def test_call_raises_too_many_requests(self):
+        request = SimpleNamespace(scope={"route": SimpleNamespace(path="/api/contacts/")})
+        user = SimpleNamespace(id=1)
+        with patch("src.services.rate_limiter.time.monotonic", return_value=0):
+            for _ in range(3):
+                await self.limiter(request, user)
+            with self.assertRaises(HTTPException) as err:
+                await self.limiter(request, user)
+        self.assertEqual(err.exception.status_code, 429)
+        self.assertEqual(err.exception.headers["Retry-After"], "10")
+
+
+class TestRedisRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.redis = FakeAsyncRedis()
+        patcher = patch.multiple(FastAPILimiter, redis=self.redis, prefix="fastapi-limiter")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = InProcessRateLimiter(times=2, seconds=10)
+        self.key = (1, "/api/contacts/")
+        self.redis_key = "fastapi-limiter:1:/api/contacts/"
+
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+
+    async def test_hit_redis_allows_up_to_times(self):
+        self.assertEqual(await self.limiter._hit_redis(self.key), 0)
+        self.assertEqual(await self.limiter._hit_redis(self.key), 0)
+        pexpire = await self.limiter._hit_redis(self.key)
+        self.assertGreater(pexpire, 0)
+        self.assertLessEqual(pexpire, 10000)
+
+    async def test_hit_redis_allows_again_after_window(self):
+        self.limiter.milliseconds = 50
+        for _ in range(2):
+            await self.limiter._hit_redis(self.key)
+        self.assertGreater(await self.limiter._hit_redis(self.key), 0)
+        await asyncio.sleep(0.1)
+        self.assertEqual(await self.limiter._hit_redis(self.key), 0)
+
+    async def test_hit_redis_restores_lost_expiration(self):
+        await self.redis.set(self.redis_key, 100)
+        self.assertEqual(await self.limiter._hit_redis(self.key), 0)
+        self.assertGreater(await self.redis.pttl(self.redis_key), 0)
+        self.assertGreater(await self.limiter._hit_redis(self.key), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,135 +1,150 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import date
-from sqlalchemy.orm import Session
-from src.database.models import Contact, User
-from src.repository.contacts import (
-    get_contacts,
-    get_contact_by_id,
-    get_contact_by_email,
-    get_contact_by_phone,
-    get_contact_by_first_name,
-    get_contact_by_second_name,
-    get_contact_by_birth_date,
-    create,
-    update,
-    remove,
-    get_contacts_birthday
-)
+from types import SimpleNamespace
+from fakeredis import FakeAsyncRedis
+from src.repository import contacts as _c
+from src.services.cache import cache
+
+class TestContacts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the coroutines only await mocks, one event loop is enough for the whole class
+        cls.loop = asyncio.new_event_loop()
+        # only the awaited session methods have to be AsyncMock, the result objects stay plain mocks
+        cls._session_template = MagicMock(execute=AsyncMock(), commit=AsyncMock(), refresh=AsyncMock(),
+                                          merge=AsyncMock())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.close()
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
 
-class TestContacts(unittest.IsolatedAsyncioTestCase):
     def setUp(self):       
-        self.user = User(id=1, username='test_user', password='qwerty', email='test@gmail.com')
-        self.session = MagicMock(spec=Session)
+        self.user = SimpleNamespace(id=1, username='test_user', email='test@gmail.com')
+        self.session = self._session_template
+        self.session.reset_mock(return_value=True, side_effect=True)
 
-    async def test_get_contacts(self):        
-        contacts = [Contact(), Contact(), Contact()]
+    def test_get_contacts(self):        
+        contacts = [{"id": 1}, {"id": 2}, {"id": 3}]
         mocked_contacts = MagicMock()
-        mocked_contacts.all.return_value = contacts
-        self.session.query.return_value.filter.return_value.limit.return_value.offset.return_value = mocked_contacts
+        mocked_contacts.mappings.return_value.all.return_value = contacts
+        self.session.execute.return_value = mocked_contacts
         limit = 10
-        offset = 0
-        result = await get_contacts(limit, offset, self.user,self.session)
-        self.assertEqual(result, contacts)
+        after_id = None
+        result = self._run(_c.get_contacts(limit, after_id, self.user,self.session))
+        self.assertEqual(result, [{**contact, "user": self.user} for contact in contacts])
     
-    async def test_get_contacts_by_id(self):  
+    def test_get_contacts_by_id(self):  
         contacts_id = 1      
-        contact = Contact(id=contacts_id, user_id=self.user.id)
+        contact = SimpleNamespace(id=contacts_id, user_id=self.user.id)
         
-        self.session.query.return_value.filter.return_value.first.return_value = contact
-        result = await get_contact_by_id(contacts_id, self.user, self.session)
-        self.assertEqual(result, contact)
-    
-    async def test_get_contact_by_email(self):        
-        email = "test@gmail.com"
-        mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_email(email, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
-    
-    async def test_get_contact_by_phone(self):        
-        phone = "0996458877"
-        mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_email(phone, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
-    
-    async def test_get_contact_by_phone(self):        
-        phone = "0996458877"
-        mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_phone(phone, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
-    
-    async def test_get_contact_by_first_name(self):        
-        first_name = "Sam"
-        mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_first_name(first_name, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
-
-    async def test_get_contact_by_second_name(self):        
-        second_name = "Test"
         mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_second_name(second_name, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
+        mocked_contact.scalars.return_value.first.return_value = contact
+        self.session.execute.return_value = mocked_contact
+        result = self._run(_c.get_contact_by_id(contacts_id, self.user, self.session))
+        self.assertEqual(result, contact)
     
-    async def test_get_contact_by_birthday(self):        
-        birthday = "2000-07-14"
-        mocked_contact = MagicMock()
-        db_session = MagicMock()        
-        db_session.query().filter().first.return_value = MagicMock()
-        result = await get_contact_by_birth_date(birth_date=birthday, user=mocked_contact, db=db_session)
-        self.assertIsNotNone(result)
+    def test_get_contacts_filtered(self):
+        filters = [
+            ("email", "test@gmail.com"),
+            ("phone", "0996458877"),
+            ("first_name", "Sam"),
+            ("second_name", "Test"),
+            ("birth_date", date(2000, 7, 14)),
+        ]
+        self.session.execute.return_value = MagicMock()
+        self.session.execute.return_value.mappings.return_value.all.return_value = [{"id": 1}]
+        for field, value in filters:
+            with self.subTest(field=field):
+                result = self._run(_c.get_contacts(10, None, user=self.user, db=self.session, **{field: value}))
+                self.assertEqual(len(result), 1)
     
-    async def test_create(self): 
+    def test_create(self): 
         #create(body: ContactModel, current_user: User, db: Session):       
         body = MagicMock()
         current_user = MagicMock()
-        db_session = MagicMock()       
-        db_session.add.return_value = None
-        db_session.commit.return_value = None
-        db_session.refresh.return_value = None       
-        result = await create(body, current_user, db_session)        
-        self.assertIsNotNone(result)
+        contact = SimpleNamespace(id=1, user_id=self.user.id)
+        self.session.execute.return_value = MagicMock()
+        self.session.execute.return_value.scalar_one_or_none.return_value = contact
+        result = self._run(_c.create(body, current_user, self.session))        
+        self.assertEqual(result, contact)
 
-    async def test_update(self): 
+    def test_create_duplicate_email(self): 
+        body = MagicMock()
+        current_user = MagicMock()
+        self.session.execute.return_value = MagicMock()
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
+        result = self._run(_c.create(body, current_user, self.session))        
+        self.assertIsNone(result)
+
+    def test_update(self): 
         #update(contact_id: int, body: ContactModel, user: User, db: Session):
         contact_id = 1
         body = MagicMock()
         current_user = MagicMock()
-        db_session = MagicMock()       
-        db_session.add.return_value = None
-        db_session.commit.return_value = None
-        db_session.refresh.return_value = None       
-        result = await update(contact_id, body, current_user, db_session)        
+        self.session.execute.return_value = MagicMock()
+        self.session.add.return_value = None
+        self.session.commit.return_value = None
+        self.session.refresh.return_value = None       
+        result = self._run(_c.update(contact_id, body, current_user, self.session))        
         self.assertIsNotNone(result)
     
-    async def test_remove(self): 
+    def test_remove(self): 
         #remove(contact_id: int, user: User, db: Session):
         contact_id = 1        
         current_user = MagicMock()
-        db_session = MagicMock()       
-        db_session.add.return_value = None
-        db_session.commit.return_value = None
-        db_session.refresh.return_value = None       
-        result = await remove(contact_id,  current_user, db_session)        
+        self.session.execute.return_value = MagicMock()
+        self.session.add.return_value = None
+        self.session.commit.return_value = None
+        self.session.refresh.return_value = None       
+        result = self._run(_c.remove(contact_id,  current_user, self.session))        
         self.assertIsNotNone(result)
     
-    async def test_get_contacts_birthday(self): 
-        #get_contacts_birthday(start_date: date, end_date: date, db: Session):
+    def _use_fake_redis(self):
+        patcher = patch.object(cache, "redis", FakeAsyncRedis())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_contact_by_id_cached(self):
+        self._use_fake_redis()
+        contact = SimpleNamespace(id=1, user_id=self.user.id)
+        self.session.execute.return_value = MagicMock()
+        self.session.execute.return_value.scalars.return_value.first.return_value = contact
+        self._run(_c.get_contact_by_id(1, self.user, self.session))
+        self.session.execute.reset_mock()
+        result = self._run(_c.get_contact_by_id(1, self.user, self.session))
+        self.session.execute.assert_not_called()
+        self.session.merge.assert_awaited_once_with(contact, load=False)
+        self.assertEqual(result, self.session.merge.return_value)
+
+    def test_update_drops_cached_contact(self):
+        self._use_fake_redis()
+        key = _c.contact_cache_key(1, self.user)
+        self._run(cache.set(key, SimpleNamespace(id=1)))
+        self.session.execute.return_value = MagicMock()
+        self._run(_c.update(1, MagicMock(), self.user, self.session))
+        self.assertIsNone(self._run(cache.get(key)))
+
+    def test_remove_drops_cached_contact(self):
+        self._use_fake_redis()
+        key = _c.contact_cache_key(1, self.user)
+        self._run(cache.set(key, SimpleNamespace(id=1)))
+        self.session.execute.return_value = MagicMock()
+        self._run(_c.remove(1, self.user, self.session))
+        self.assertIsNone(self._run(cache.get(key)))
+    
+    def test_get_contacts_birthday(self): 
+        #get_contacts_birthday(start_date: date, end_date: date, user: User, db: AsyncSession):
         start_date = date(2024, 1, 28)
         end_date = date(2024, 2, 14)
-        db = MagicMock() 
-        contacts_range = [MagicMock(), MagicMock(), MagicMock()]       
-        db.query().filter().all.return_value = contacts_range     
-        result = await get_contacts_birthday(start_date, end_date, db)        
+        contacts_range = [MagicMock(), MagicMock(), MagicMock()]
+        self.session.execute.return_value = MagicMock()
+        self.session.execute.return_value.scalars.return_value.all.return_value = contacts_range
+        result = self._run(_c.get_contacts_birthday(start_date, end_date, self.user, self.session))        
         self.assertEqual(len(result), len(contacts_range))
    
 
@@ -0,0 +1,50 @@
+import unittest
+from datetime import date
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import get_contacts_birthday
+
+
+class TestContactsBirthday(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # the WHERE clause is what is tested here, so the query runs against a real database
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+        self.user = User(email="test@gmail.com", password="qwerty")
+        self.other_user = User(email="other@gmail.com", password="qwerty")
+        self.session.add_all([self.user, self.other_user])
+        await self.session.flush()
+        birthdays = {
+            "before": date(1990, 12, 27),
+            "first_day": date(1985, 12, 28),
+            "new_year": date(2000, 1, 1),
+            "last_day": date(1995, 1, 4),
+            "after": date(1999, 1, 5),
+        }
+        for number, (name, birth_date) in enumerate(birthdays.items()):
+            self.session.add(Contact(first_name=name, second_name="Test", email=f"{name}@gmail.com",
+                                     phone=f"09900000{number}", birth_date=birth_date, user_id=self.user.id))
+        self.session.add(Contact(first_name="foreign", second_name="Test", email="foreign@gmail.com",
+                                 phone="0990000099", birth_date=date(2000, 1, 1), user_id=self.other_user.id))
+        await self.session.commit()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_range_crosses_new_year(self):
+        result = await get_contacts_birthday(date(2024, 12, 28), date(2025, 1, 4), self.user, self.session)
+        self.assertEqual(sorted(contact.first_name for contact in result), ["first_day", "last_day", "new_year"])
+
+    async def test_contacts_of_other_users_are_excluded(self):
+        result = await get_contacts_birthday(date(2024, 12, 28), date(2025, 1, 4), self.other_user, self.session)
+        self.assertEqual([contact.first_name for contact in result], ["foreign"])
+
+
+if __name__ == '__main__':
+    unittest.main()
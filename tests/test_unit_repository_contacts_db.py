@@ -0,0 +1,126 @@
+import unittest
+from datetime import date
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import get_contacts, get_contact_by_id
+
+# owner, first name, second name, birth date, in insert order so the ids of both users interleave
+CONTACTS = [
+    ("user", "Sam", "Smith", date(1990, 1, 1)),
+    ("other_user", "Sam", "Smith", date(1990, 1, 1)),
+    ("user", "Sam", "Brown", date(1991, 2, 2)),
+    ("user", "Ann", "Smith", date(1992, 3, 3)),
+    ("other_user", "Ann", "Lee", date(1993, 4, 4)),
+    ("user", "Bob", "Lee", date(1990, 1, 1)),
+    ("user", "Sam", "Smith", date(1994, 5, 5)),
+]
+
+
+class TestContactsQueries(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # the statements are cached by SQLAlchemy, only a real database shows that every call gets its own values
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+        self.user = User(email="test@gmail.com", password="qwerty")
+        self.other_user = User(email="other@gmail.com", password="qwerty")
+        self.session.add_all([self.user, self.other_user])
+        await self.session.flush()
+        self.contacts = {"user": [], "other_user": []}
+        for number, (owner, first_name, second_name, birth_date) in enumerate(CONTACTS):
+            contact = Contact(first_name=first_name, second_name=second_name, email=f"contact{number}@gmail.com",
+                              phone=f"09900000{number}", birth_date=birth_date, user_id=getattr(self, owner).id)
+            self.session.add(contact)
+            await self.session.flush()
+            self.contacts[owner].append(contact)
+        await self.session.commit()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    def ids(self, owner, **fields):
+        return [contact.id for contact in self.contacts[owner]
+                if all(getattr(contact, field) == value for field, value in fields.items())]
+
+    async def test_get_contacts_limit_changes_between_calls(self):
+        for limit in (1, 3, 2, 10):
+            with self.subTest(limit=limit):
+                result = await get_contacts(limit, None, self.user, self.session)
+                self.assertEqual([contact["id"] for contact in result], self.ids("user")[:limit])
+
+    async def test_get_contacts_filter_values_change_between_calls(self):
+        for field, value in [("first_name", "Sam"), ("first_name", "Ann"), ("second_name", "Lee"),
+                             ("email", "contact3@gmail.com"), ("phone", "099000005"),
+                             ("birth_date", date(1990, 1, 1))]:
+            with self.subTest(field=field, value=value):
+                result = await get_contacts(10, None, self.user, self.session, **{field: value})
+                self.assertEqual([contact["id"] for contact in result], self.ids("user", **{field: value}))
+
+    async def test_get_contacts_user_changes_between_calls(self):
+        for owner in ("user", "other_user", "user", "other_user"):
+            with self.subTest(owner=owner):
+                user = getattr(self, owner)
+                result = await get_contacts(10, None, user, self.session)
+                self.assertEqual([contact["id"] for contact in result], self.ids(owner))
+                self.assertTrue(all(contact["user"] is user for contact in result))
+                result = await get_contacts(10, None, user, self.session, first_name="Ann")
+                self.assertEqual([contact["id"] for contact in result], self.ids(owner, first_name="Ann"))
+
+    async def test_get_contacts_pages_follow_each_other(self):
+        pages = []
+        after_id = None
+        while True:
+            page = [contact["id"] for contact in await get_contacts(2, after_id, self.user, self.session)]
+            if not page:
+                break
+            self.assertLessEqual(len(page), 2)
+            self.assertEqual(page, sorted(page))
+            if after_id is not None:
+                self.assertGreater(page[0], after_id)
+            pages.append(page)
+            after_id = page[-1]
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([contact_id for page in pages for contact_id in page], self.ids("user"))
+
+    async def test_get_contacts_after_id_is_exclusive(self):
+        ids = self.ids("user")
+        result = await get_contacts(10, ids[1], self.user, self.session)
+        self.assertEqual([contact["id"] for contact in result], ids[2:])
+        self.assertEqual(await get_contacts(10, ids[-1], self.user, self.session), [])
+
+    async def test_get_contacts_filters_combine(self):
+        cases = [
+            {"first_name": "Sam", "second_name": "Smith"},
+            {"second_name": "Smith", "birth_date": date(1990, 1, 1)},
+            {"first_name": "Sam", "second_name": "Smith", "birth_date": date(1994, 5, 5)},
+            {"first_name": "Bob", "second_name": "Smith"},
+        ]
+        for fields in cases:
+            with self.subTest(**fields):
+                result = await get_contacts(10, None, self.user, self.session, **fields)
+                self.assertEqual([contact["id"] for contact in result], self.ids("user", **fields))
+        sams = await get_contacts(10, None, self.user, self.session, first_name="Sam")
+        sam_smiths = await get_contacts(10, None, self.user, self.session, first_name="Sam", second_name="Smith")
+        self.assertLess(len(sam_smiths), len(sams))
+
+    async def test_get_contacts_filters_with_pagination(self):
+        ids = self.ids("user", first_name="Sam")
+        result = await get_contacts(1, ids[0], self.user, self.session, first_name="Sam")
+        self.assertEqual([contact["id"] for contact in result], ids[1:2])
+
+    async def test_get_contact_by_id_only_returns_own_contacts(self):
+        for owner, other in (("user", "other_user"), ("other_user", "user")):
+            for contact in self.contacts[owner]:
+                with self.subTest(owner=owner, contact_id=contact.id):
+                    result = await get_contact_by_id(contact.id, getattr(self, owner), self.session)
+                    self.assertEqual(result.id, contact.id)
+                    self.assertIsNone(await get_contact_by_id(contact.id, getattr(self, other), self.session))
+
+
+if __name__ == '__main__':
+    unittest.main()
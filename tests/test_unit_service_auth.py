@@ -0,0 +1,49 @@
+import unittest
+from collections import OrderedDict
+from unittest.mock import patch
+
+from src.services.auth import Auth
+
+
+class TestUsersCache(unittest.TestCase):
+    def setUp(self):
+        self.auth = Auth()
+        # users_cache is shared by the class, give every test its own one
+        self.auth.users_cache = OrderedDict()
+        self.auth.users_cache_ttl = 10
+        self.auth.users_cache_maxsize = 2
+
+    def at(self, seconds):
+        return patch("src.services.auth.time.time", return_value=seconds)
+
+    def test_cached_user_expires_after_ttl(self):
+        with self.at(100):
+            self.auth.cache_user("token", b"user", token_expire=1000)
+        with self.at(109):
+            self.assertEqual(self.auth.get_cached_user("token"), b"user")
+        with self.at(110):
+            self.assertIsNone(self.auth.get_cached_user("token"))
+        self.assertNotIn("token", self.auth.users_cache)
+
+    def test_cached_user_expires_with_token(self):
+        with self.at(100):
+            self.auth.cache_user("token", b"user", token_expire=105)
+        with self.at(104):
+            self.assertEqual(self.auth.get_cached_user("token"), b"user")
+        with self.at(105):
+            self.assertIsNone(self.auth.get_cached_user("token"))
+
+    def test_least_recently_used_token_is_evicted(self):
+        with self.at(100):
+            self.auth.cache_user("first", b"first", token_expire=1000)
+            self.auth.cache_user("second", b"second", token_expire=1000)
+            self.auth.get_cached_user("first")
+            self.auth.cache_user("third", b"third", token_expire=1000)
+            self.assertEqual(self.auth.get_cached_user("first"), b"first")
+            self.assertIsNone(self.auth.get_cached_user("second"))
+            self.assertEqual(self.auth.get_cached_user("third"), b"third")
+        self.assertEqual(len(self.auth.users_cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()